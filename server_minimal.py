@@ -10,22 +10,33 @@ import urllib.parse
 import json
 import tempfile
 import os
+import gzip
 import threading
 import time
-import cgi
 import shutil
-import requests
 from pathlib import Path
 import mimetypes
 import sys
 import uuid
 import warnings
 import re
+import itertools
+import secrets
+import select
 import subprocess
+import concurrent.futures
 warnings.filterwarnings("ignore")
 
-# Import AI transcription libraries
-import whisper
+# Import AI transcription libraries. Prefer faster-whisper (CTranslate2
+# with int8 quantization, ~4x faster on CPU) and fall back to the
+# reference implementation.
+FASTER_WHISPER_AVAILABLE = False
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+    print("✅ faster-whisper (CTranslate2) backend available")
+except ImportError:
+    import whisper
 from moviepy.editor import VideoFileClip
 import torch
 import numpy as np
@@ -35,8 +46,387 @@ print("✅ Core AI libraries loaded successfully")
 # Get port from environment variable or default to 5555
 PORT = int(os.environ.get('PORT', '5555'))
 
+# orjson serializes 2-5x faster than the stdlib json module and skips
+# the intermediate str (it returns bytes directly); fall back quietly
+# when it isn't installed
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+
+    _json_loads = json.loads
+
+# Model size is a policy knob: English-only flows can drop to
+# "distil-small.en" or "tiny" for a multiple of the speed at similar
+# accuracy. "base" stays the default so multilingual uploads keep working.
+WHISPER_MODEL = os.environ.get('WHISPER_MODEL', 'base')
+
+# Shared pool for clip generation. Threads, not processes: the workers
+# only babysit ffmpeg subprocesses, so the GIL is never contended and
+# each ffmpeg already parallelizes its own encode.
+_TRIM_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=max(2, (os.cpu_count() or 4) // 2))
+
+# Clip ids only need to be unique, not unguessable: one random tag per
+# process plus a counter, instead of uuid4's urandom read and 36-char
+# formatting for every generated clip. next() on a count is atomic
+# under the GIL, so no lock is needed.
+_CLIP_TAG = secrets.token_hex(4)
+_clip_counter = itertools.count(1)
+
+def next_clip_id():
+    """Cheap process-unique id for generated clip filenames"""
+    return f"{_CLIP_TAG}{next(_clip_counter):08x}"
+
+def _tmpfs_model_dir():
+    """
+    Mirror cached Whisper weights onto tmpfs so loading them is a read
+    from RAM, and any future worker processes share the same physical
+    pages. Returns the cache dir to load from, or None to use defaults.
+    """
+    if not os.path.isdir('/dev/shm') or os.environ.get('WHISPER_TMPFS', '1') != '1':
+        return None
+
+    dest = '/dev/shm/clipsai_whisper'
+    try:
+        if FASTER_WHISPER_AVAILABLE:
+            hub = os.path.expanduser('~/.cache/huggingface/hub')
+            candidates = [
+                os.path.join(hub, f'models--Systran--faster-whisper-{WHISPER_MODEL}'),
+                os.path.join(hub, 'models--Systran--faster-distil-whisper-'
+                                  f'{WHISPER_MODEL.replace("distil-", "")}'),
+            ]
+            src = next((c for c in candidates if os.path.isdir(c)), None)
+            if src:
+                target = os.path.join(dest, os.path.basename(src))
+                if not os.path.isdir(target):
+                    os.makedirs(dest, exist_ok=True)
+                    shutil.copytree(src, target)
+                return dest
+        else:
+            src = os.path.expanduser(f'~/.cache/whisper/{WHISPER_MODEL}.pt')
+            if os.path.isfile(src):
+                os.makedirs(dest, exist_ok=True)
+                target = os.path.join(dest, f'{WHISPER_MODEL}.pt')
+                if not os.path.isfile(target):
+                    shutil.copy2(src, target)
+                return dest
+    except OSError as e:
+        print(f"⚠️  tmpfs model warm failed: {e}")
+
+    return None
+
+def load_whisper_model():
+    """Load the configured Whisper model on the fastest available backend"""
+    download_root = _tmpfs_model_dir()
+    # WHISPER_DEVICE overrides auto-detection, e.g. to pin inference to
+    # the CPU on a box whose GPU is busy serving something else
+    device = os.environ.get('WHISPER_DEVICE') or (
+        'cuda' if torch.cuda.is_available() else 'cpu')
+    if FASTER_WHISPER_AVAILABLE:
+        if device == 'cuda':
+            # fp16 halves memory bandwidth and runs on tensor cores
+            return WhisperModel(WHISPER_MODEL, device="cuda", compute_type="float16",
+                                download_root=download_root)
+        # int8 weights are 4x smaller than fp32 and use int8 GEMM kernels;
+        # CTranslate2 defaults to 4 intra-op threads, so tell it to use
+        # every core for the single-model-single-request common case
+        return WhisperModel(WHISPER_MODEL, device=device, compute_type="int8",
+                            cpu_threads=os.cpu_count() or 4,
+                            download_root=download_root)
+    return whisper.load_model(WHISPER_MODEL, device=device,
+                              download_root=download_root)
+
+_whisper_model = None
+_whisper_lock = threading.Lock()
+
+def get_whisper_model():
+    """Load the Whisper model once and share it across requests"""
+    global _whisper_model
+    if _whisper_model is None:
+        # Double-checked so the common path skips the lock entirely
+        with _whisper_lock:
+            if _whisper_model is None:
+                print("🎤 Loading Whisper model...")
+                _whisper_model = load_whisper_model()
+                print("✅ Whisper model ready")
+    return _whisper_model
+
+# The most recently decoded tracks, keyed by (path, mtime). 16 kHz mono
+# float32 is ~3.7 MB per minute, so keep only a couple of entries — just
+# enough for back-to-back endpoints hitting the same upload.
+_audio_cache = {}
+_audio_cache_lock = threading.Lock()
+
+def decode_audio(video_path):
+    """
+    Decode the audio track once to 16 kHz mono float32 PCM
+
+    Whisper otherwise shells out to ffmpeg itself and demuxes the whole
+    video container; piping s16le PCM skips the video stream entirely
+    and avoids a temp file. Recent tracks are cached so consecutive
+    requests against the same video don't decode twice.
+    """
+    try:
+        stat = os.stat(video_path)
+        key = (video_path, stat.st_mtime)
+    except OSError:
+        key = None
+
+    if key is not None:
+        with _audio_cache_lock:
+            cached = _audio_cache.get(key)
+        if cached is not None:
+            return cached
+
+    try:
+        cmd = [
+            'ffmpeg', '-v', 'quiet',
+            '-i', video_path,
+            '-f', 's16le', '-ac', '1', '-ar', '16000',
+            '-'
+        ]
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, timeout=300)
+
+        if result.returncode == 0 and result.stdout:
+            audio = np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+            if key is not None:
+                with _audio_cache_lock:
+                    if len(_audio_cache) >= 2:
+                        _audio_cache.clear()
+                    _audio_cache[key] = audio
+            return audio
+    except Exception as e:
+        print(f"⚠️  Audio decode failed: {e}")
+
+    return None
+
+def run_transcription(model, video_path):
+    """
+    Transcribe a video and normalize the result to the
+    {"text": ..., "segments": [...]} shape the handlers expect
+    """
+    audio = decode_audio(video_path)
+    source = audio if audio is not None else video_path
+
+    if FASTER_WHISPER_AVAILABLE:
+        # VAD drops silent stretches before they reach the decoder; a
+        # 500 ms minimum keeps natural pauses from splitting sentences
+        segments_iter, info = model.transcribe(
+            source, beam_size=1,
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=500),
+            condition_on_previous_text=False)
+        segments = []
+        text_parts = []
+        for i, segment in enumerate(segments_iter):
+            segments.append({
+                "id": i,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "no_speech_prob": segment.no_speech_prob
+            })
+            text_parts.append(segment.text)
+
+        return {"text": "".join(text_parts), "segments": segments}
+
+    result = model.transcribe(source)
+    # Normalize to the same lean segment shape as the faster-whisper
+    # branch — the raw segments also carry tokens, logprobs and seek
+    # offsets that nothing downstream reads
+    segments = [{
+        "id": i,
+        "start": segment["start"],
+        "end": segment["end"],
+        "text": segment["text"],
+        "no_speech_prob": segment.get("no_speech_prob", 0.0)
+    } for i, segment in enumerate(result["segments"])]
+    return {"text": result["text"], "segments": segments}
+
+# Single-worker inference queue. Concurrent transcribe requests used to
+# run the model from several HTTP threads at once: the reference decoder
+# isn't reentrant, and on CPU faster-whisper already saturates the cores
+# it's given, so overlapping passes only thrash. Requests queue up here
+# in arrival order while the HTTP threads stay free to answer health
+# checks and serve file ranges.
+_ASR_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+def _run_asr(video_path):
+    """Queue worker body: transcribe one video on the shared model"""
+    return run_transcription(get_whisper_model(), video_path)
+
+_transcript_cache = {}
+_transcript_lock = threading.Lock()
+
+def _transcript_sidecar_path(video_path):
+    """Where the on-disk copy of a video's transcript lives"""
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    return os.path.join('./downloads', f'{stem}.transcript.json')
+
+def transcribe_cached(video_path):
+    """
+    Transcribe a video, reusing earlier results where possible
+
+    Transcription dominates both the transcribe and find_clips handlers,
+    and the typical flow calls them back to back on the same upload.
+    Results are keyed on (path, mtime, model) in memory and mirrored to
+    a sidecar JSON in ./downloads so a restarted server still skips the
+    Whisper pass.
+    """
+    try:
+        mtime = os.path.getmtime(video_path)
+    except OSError:
+        mtime = 0.0
+    key = [video_path, mtime, WHISPER_MODEL]
+
+    with _transcript_lock:
+        cached = _transcript_cache.get(tuple(key))
+    if cached is not None:
+        return cached
+
+    # Survive restarts: check the sidecar before paying for inference
+    sidecar = _transcript_sidecar_path(video_path)
+    try:
+        if os.path.exists(sidecar):
+            with open(sidecar, 'rb') as f:
+                stored = json.loads(f.read())
+            if stored.get('key') == key:
+                with _transcript_lock:
+                    _transcript_cache[tuple(key)] = stored['result']
+                return stored['result']
+    except Exception as e:
+        print(f"⚠️  Transcript sidecar read failed: {e}")
+
+    result = _ASR_POOL.submit(_run_asr, video_path).result()
+
+    with _transcript_lock:
+        if len(_transcript_cache) > 32:
+            _transcript_cache.clear()
+        _transcript_cache[tuple(key)] = result
+
+    try:
+        os.makedirs('./downloads', exist_ok=True)
+        with open(sidecar, 'w') as f:
+            json.dump({'key': key, 'result': result}, f)
+    except Exception as e:
+        print(f"⚠️  Transcript sidecar write failed: {e}")
+
+    return result
+
+def _stream_upload_to_file(rfile, content_type, content_length, dest_path_for):
+    """
+    Stream the video field of a multipart/form-data body straight to disk
+
+    Reads the socket in 1 MiB chunks and only rescans a short tail
+    overlap for the boundary, so peak memory stays O(chunk) instead of
+    O(file) as with cgi.FieldStorage. Returns (original_name, dest_path,
+    bytes_written); raises ValueError on malformed bodies.
+    """
+    match = re.search(r'boundary=("?)([^";]+)\1', content_type)
+    if not match:
+        raise ValueError("Malformed multipart request: no boundary")
+    boundary = b'--' + match.group(2).encode()
+
+    remaining = content_length
+    buf = bytearray()
+
+    def fill(n=1 << 20):
+        nonlocal remaining
+        if remaining <= 0:
+            return False
+        chunk = rfile.read(min(n, remaining))
+        if not chunk:
+            remaining = 0
+            return False
+        remaining -= len(chunk)
+        buf.extend(chunk)
+        return True
+
+    closing = b'\r\n' + boundary
+    # Bytes to keep at the tail so a boundary split across reads is found
+    keep = len(closing) + 2
+
+    def next_part_headers():
+        """Read up to the end of the next part's header block"""
+        while True:
+            header_end = buf.find(b'\r\n\r\n')
+            if header_end >= 0:
+                headers = bytes(buf[:header_end]).decode('utf-8', 'replace')
+                del buf[:header_end + 4]
+                return headers
+            if not fill():
+                return None
+
+    def skip_part_body():
+        """Discard body bytes up to (but not past) the next boundary"""
+        while True:
+            cut = buf.find(closing)
+            if cut >= 0:
+                del buf[:cut]
+                return True
+            if len(buf) > keep:
+                del buf[:len(buf) - keep]
+            if not fill():
+                return False
+
+    # The video field can sit anywhere in the body — cgi.FieldStorage
+    # accepted that, so skip over any fields that precede it
+    while True:
+        part_headers = next_part_headers()
+        if part_headers is None:
+            raise ValueError("No video file provided")
+        if 'name="video"' in part_headers:
+            break
+        if not skip_part_body():
+            raise ValueError("No video file provided")
+
+    filename_match = re.search(r'filename="([^"]*)"', part_headers)
+    original_name = filename_match.group(1) if filename_match else ''
+
+    dest_path = dest_path_for(original_name)
+    written = 0
+
+    with open(dest_path, 'wb') as out:
+        while True:
+            cut = buf.find(closing)
+            if cut >= 0:
+                out.write(memoryview(buf)[:cut])
+                written += cut
+                break
+
+            if len(buf) > keep:
+                flush = len(buf) - keep
+                out.write(memoryview(buf)[:flush])
+                written += flush
+                del buf[:flush]
+
+            if not fill():
+                raise ValueError("Malformed multipart request: unterminated part")
+
+    # Consume whatever trails the video part (further fields, the
+    # closing boundary): on a keep-alive connection, unread body bytes
+    # would be parsed as the start of the next request
+    while remaining > 0:
+        buf.clear()
+        if not fill():
+            break
+    buf.clear()
+
+    return original_name, dest_path, written
+
 class PreciseVideoTrimmer:
     """Handles precise video trimming without fallbacks"""
+
+    # ffprobe results keyed by (path, mtime, size) — each generated clip
+    # was re-spawning ffprobe against the same source video
+    _duration_cache = {}
     
     def trim_video_precise(self, input_path, output_path, start_time, end_time):
         """
@@ -60,26 +450,63 @@ class PreciseVideoTrimmer:
             if clip_duration <= 0:
                 raise ValueError(f"Invalid clip duration: {clip_duration}")
             
-            # Build FFmpeg command with precise parameters
-            cmd = [
-                'ffmpeg', '-y',
+            # Try a stream copy first: when the cut lands on a keyframe
+            # this skips the x264 re-encode entirely and runs at I/O
+            # speed. Verify the result is the right length, otherwise
+            # fall through to the precise re-encode.
+            copy_cmd = [
+                'ffmpeg', '-y', '-loglevel', 'error', '-nostats',
                 '-ss', str(start_time),
                 '-i', input_path,
                 '-t', str(clip_duration),
+                '-c', 'copy',
+                '-movflags', '+faststart',
+                '-avoid_negative_ts', 'make_zero',
+                output_path
+            ]
+            result = subprocess.run(copy_cmd, stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL, timeout=300)
+
+            if result.returncode == 0 and os.path.exists(output_path) and os.path.getsize(output_path) >= 1024:
+                copied_duration = self.get_video_duration(output_path)
+                if copied_duration is not None and abs(copied_duration - clip_duration) <= 0.2:
+                    return True
+
+            if os.path.exists(output_path):
+                os.remove(output_path)
+
+            # Two-stage seek: a coarse keyframe seek before -i (fast,
+            # no decode) plus a small accurate seek after it for the
+            # residual. Audio is stream-copied — only video needs the
+            # re-encode for frame accuracy.
+            coarse_seek = max(0.0, start_time - 2.0)
+            cmd = [
+                'ffmpeg', '-y', '-loglevel', 'error', '-nostats',
+                '-ss', str(coarse_seek),
+                '-i', input_path,
+                '-ss', str(start_time - coarse_seek),
+                '-t', str(clip_duration),
                 '-c:v', 'libx264',
-                '-preset', 'fast',
+                '-preset', 'veryfast',
                 '-crf', '23',
                 '-pix_fmt', 'yuv420p',
+                '-c:a', 'copy',
                 '-movflags', '+faststart',
                 '-avoid_negative_ts', 'make_zero',
                 output_path
             ]
             
-            # Execute with error handling
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            # Execute with error handling. With -loglevel error the pipe
+            # only carries real errors, not tens of KB of progress lines;
+            # decode stderr lazily and only the tail on failure.
+            result = subprocess.run(cmd, stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE, timeout=300)
             
             if result.returncode != 0:
-                raise RuntimeError(f"FFmpeg failed: {result.stderr}")
+                stderr_tail = result.stderr[-4096:].decode('utf-8', 'replace')
+                raise RuntimeError(f"FFmpeg failed: {stderr_tail}")
             
             # Verify output file was created and has reasonable size
             if not os.path.exists(output_path):
@@ -98,8 +525,73 @@ class PreciseVideoTrimmer:
                 os.remove(output_path)
             return False
     
+    def trim_clips_batch(self, input_path, jobs):
+        """
+        Cut several clips from one input in a single ffmpeg invocation
+
+        jobs is a list of (output_path, start_time, end_time). One
+        process demuxes the input once and stream-copies every output
+        spec, instead of N processes each re-opening and re-seeking the
+        same file. Returns a list of bools; entries that fail duration
+        verification are cleaned up and should be retried with
+        trim_video_precise for a frame-accurate re-encode.
+        """
+        results = [False] * len(jobs)
+        if not jobs:
+            return results
+
+        try:
+            duration = self.get_video_duration(input_path)
+            if duration is None:
+                return results
+
+            cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-nostats',
+                   '-i', input_path]
+            for output_path, start_time, end_time in jobs:
+                cmd += [
+                    '-ss', str(max(0, start_time)),
+                    '-to', str(min(duration, end_time)),
+                    '-c', 'copy',
+                    '-movflags', '+faststart',
+                    '-avoid_negative_ts', 'make_zero',
+                    output_path
+                ]
+
+            subprocess.run(cmd, stdin=subprocess.DEVNULL,
+                           stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=600)
+
+            # Stream copy cuts on packet boundaries, so verify each
+            # output's length just like the single-clip copy fast path
+            for i, (output_path, start_time, end_time) in enumerate(jobs):
+                clip_duration = min(duration, end_time) - max(0, start_time)
+                if clip_duration <= 0:
+                    continue
+                if os.path.exists(output_path) and os.path.getsize(output_path) >= 1024:
+                    copied_duration = self.get_video_duration(output_path)
+                    if copied_duration is not None and abs(copied_duration - clip_duration) <= 0.2:
+                        results[i] = True
+                        continue
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+
+        except Exception as e:
+            print(f"❌ Batch trimming failed: {e}")
+
+        return results
+
     def get_video_duration(self, video_path):
-        """Get video duration using FFprobe"""
+        """Get video duration using FFprobe (cached per file version)"""
+        try:
+            stat = os.stat(video_path)
+            key = (video_path, stat.st_mtime, stat.st_size)
+        except OSError:
+            return None
+
+        cached = self._duration_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
             cmd = [
                 'ffprobe', '-v', 'quiet',
@@ -110,12 +602,19 @@ class PreciseVideoTrimmer:
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
             
             if result.returncode == 0:
-                return float(result.stdout.strip())
+                duration = float(result.stdout.strip())
+                if len(self._duration_cache) > 256:
+                    self._duration_cache.clear()
+                self._duration_cache[key] = duration
+                return duration
         except Exception as e:
             print(f"❌ Duration check failed: {e}")
         
         return None
 
+# Compiled once — browsers issue many Range requests while scrubbing video
+_RANGE_PAIR_RE = re.compile(r'(\d*)-(\d*)')
+
 class RobustFileServer:
     """Handles robust file serving with broken pipe error handling"""
     
@@ -129,15 +628,16 @@ class RobustFileServer:
             
             if range_header:
                 # Parse range header
-                range_match = re.match(r'bytes=(\d+)-(\d*)', range_header)
-                if range_match:
-                    start = int(range_match.group(1))
-                    end = int(range_match.group(2)) if range_match.group(2) else file_size - 1
-                    
-                    # Validate range
-                    start = max(0, min(start, file_size - 1))
-                    end = max(start, min(end, file_size - 1))
-                    
+                ranges = RobustFileServer._parse_ranges(range_header, file_size)
+
+                # RFC 7233 multi-range requests get a multipart/byteranges
+                # body instead of the old full-file fallback
+                if len(ranges) > 1:
+                    return RobustFileServer._serve_multirange(
+                        request_handler, file_path, ranges, file_size)
+
+                if ranges:
+                    start, end = ranges[0]
                     content_length = end - start + 1
                     
                     request_handler.send_response(206)
@@ -166,30 +666,55 @@ class RobustFileServer:
             
             # Serve file content
             with open(file_path, 'rb') as f:
-                f.seek(start)
-                remaining = content_length
+                # Hint the kernel that this span is a sequential read so
+                # it read-ahead aggressively
+                if hasattr(os, 'posix_fadvise'):
+                    try:
+                        os.posix_fadvise(f.fileno(), start, content_length,
+                                         os.POSIX_FADV_SEQUENTIAL)
+                    except OSError:
+                        pass
+
+                # Zero-copy fast path; falls through to the chunked loop
+                # when sendfile isn't usable on this platform/socket
+                if not RobustFileServer._sendfile(request_handler, f, start, content_length):
+                    f.seek(start)
+                    remaining = content_length
                 
-                while remaining > 0:
-                    # Check if client is still connected
-                    if not hasattr(request_handler, 'wfile') or request_handler.wfile.closed:
-                        break
+                    while remaining > 0:
+                        # Check if client is still connected
+                        if not hasattr(request_handler, 'wfile') or request_handler.wfile.closed:
+                            break
                     
-                    chunk_size = min(8192, remaining)
-                    chunk = f.read(chunk_size)
+                        # 1 MiB chunks — 8 KiB meant ~128 syscalls per MB
+                        chunk_size = min(1 << 20, remaining)
+                        chunk = f.read(chunk_size)
                     
-                    if not chunk:
-                        break
+                        if not chunk:
+                            break
                     
+                        try:
+                            request_handler.wfile.write(chunk)
+                            remaining -= len(chunk)
+                        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                            # Client disconnected, stop serving
+                            break
+                        except Exception as e:
+                            print(f"❌ File serving error: {e}")
+                            break
+
                     try:
-                        request_handler.wfile.write(chunk)
                         request_handler.wfile.flush()
-                        remaining -= len(chunk)
                     except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
-                        # Client disconnected, stop serving
-                        break
-                    except Exception as e:
-                        print(f"❌ File serving error: {e}")
-                        break
+                        pass
+
+                # One-shot transfers of very large files shouldn't evict
+                # everything else from the page cache
+                if file_size > (200 << 20) and hasattr(os, 'posix_fadvise'):
+                    try:
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+                    except OSError:
+                        pass
             
             return True
             
@@ -197,11 +722,170 @@ class RobustFileServer:
             print(f"❌ File serving failed: {e}")
             return False
 
+    @staticmethod
+    def _parse_ranges(range_header, file_size):
+        """Parse a Range header into a sorted, merged [start, end] list"""
+        if not range_header.startswith('bytes='):
+            return []
+
+        ranges = []
+        for first, last in _RANGE_PAIR_RE.findall(range_header[6:]):
+            if first:
+                start = int(first)
+                end = int(last) if last else file_size - 1
+            elif last:
+                # Suffix range: the final N bytes
+                start = max(0, file_size - int(last))
+                end = file_size - 1
+            else:
+                continue
+
+            if start >= file_size:
+                continue
+            start = max(0, min(start, file_size - 1))
+            end = max(start, min(end, file_size - 1))
+            ranges.append([start, end])
+
+        # Coalesce overlapping/adjacent ranges so a hostile header can't
+        # multiply the response size
+        ranges.sort()
+        merged = []
+        for start, end in ranges:
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(end, merged[-1][1])
+            else:
+                merged.append([start, end])
+
+        return merged
+
+    @staticmethod
+    def _serve_multirange(request_handler, file_path, ranges, file_size):
+        """Send an RFC 7233 multipart/byteranges response"""
+        try:
+            content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+            boundary = uuid.uuid4().hex
+
+            part_headers = []
+            total = 0
+            for start, end in ranges:
+                header = (f'\r\n--{boundary}\r\n'
+                          f'Content-Type: {content_type}\r\n'
+                          f'Content-Range: bytes {start}-{end}/{file_size}\r\n\r\n').encode()
+                part_headers.append(header)
+                total += len(header) + (end - start + 1)
+            closing = f'\r\n--{boundary}--\r\n'.encode()
+            total += len(closing)
+
+            request_handler.send_response(206)
+            request_handler.send_header('Content-Type',
+                                        f'multipart/byteranges; boundary={boundary}')
+            request_handler.send_header('Content-Length', str(total))
+            request_handler.send_header('Accept-Ranges', 'bytes')
+            request_handler.end_headers()
+
+            with open(file_path, 'rb') as f:
+                for header, (start, end) in zip(part_headers, ranges):
+                    request_handler.wfile.write(header)
+                    count = end - start + 1
+
+                    if RobustFileServer._sendfile(request_handler, f, start, count):
+                        continue
+
+                    f.seek(start)
+                    remaining = count
+                    while remaining > 0:
+                        chunk = f.read(min(1 << 20, remaining))
+                        if not chunk:
+                            break
+                        request_handler.wfile.write(chunk)
+                        remaining -= len(chunk)
+
+                request_handler.wfile.write(closing)
+                request_handler.wfile.flush()
+
+            return True
+
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            return True
+        except Exception as e:
+            print(f"❌ Multi-range serving failed: {e}")
+            return False
+
+    @staticmethod
+    def _sendfile(request_handler, f, offset, count):
+        """
+        Transfer file bytes with sendfile(2) — the kernel copies straight
+        from the page cache to the socket, skipping userspace entirely.
+        Returns False when unsupported so the caller can fall back to the
+        chunked read/write loop.
+        """
+        if not hasattr(os, 'sendfile'):
+            return False
+
+        try:
+            out_fd = request_handler.connection.fileno()
+            request_handler.wfile.flush()
+        except Exception:
+            return False
+
+        remaining = count
+        sent_any = False
+
+        while remaining > 0:
+            try:
+                sent = os.sendfile(out_fd, f.fileno(), offset, min(remaining, 2 << 20))
+            except BlockingIOError:
+                # Full send buffer on a non-blocking socket — wait for it
+                # to drain rather than busy-looping. A client that stays
+                # unwritable for the whole timeout is stalled for good;
+                # give up instead of pinning this thread forever.
+                try:
+                    _, writable, _ = select.select([], [out_fd], [], 30)
+                except Exception:
+                    break
+                if not writable:
+                    request_handler.close_connection = True
+                    break
+                continue
+            except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                # Client disconnected, stop serving
+                break
+            except OSError:
+                # sendfile not usable here; only safe to fall back if
+                # nothing was sent yet
+                return sent_any
+
+            if sent == 0:
+                break
+
+            sent_any = True
+            offset += sent
+            remaining -= sent
+
+        return True
+
 class ClipsAIHandler(http.server.SimpleHTTPRequestHandler):
     """Main request handler with minimal dependencies"""
     
     upload_dir = os.environ.get('UPLOAD_DIR', './uploads')
-    
+
+    # HTTP/1.1 keep-alive: browsers reuse one connection across the API
+    # calls and video scrubbing instead of paying a TCP handshake per
+    # request. Safe because every response path sends Content-Length.
+    protocol_version = 'HTTP/1.1'
+
+    # Small responses should leave as one segment, promptly: Nagle off
+    # so the kernel doesn't sit on the final write, and a buffered wfile
+    # so the chunked file-serving fallback batches its writes (the
+    # sendfile path flushes before handing the fd to the kernel).
+    disable_nagle_algorithm = True
+    wbufsize = 64 * 1024
+
+    # video_id → saved path, populated at upload time; the directory
+    # scan remains only as a fallback for files from earlier runs
+    _video_index = {}
+    _video_index_lock = threading.Lock()
+
     def __init__(self, *args, **kwargs):
         self.trimmer = PreciseVideoTrimmer()
         self.file_server = RobustFileServer()
@@ -223,6 +907,16 @@ class ClipsAIHandler(http.server.SimpleHTTPRequestHandler):
         
         print(f"📁 Upload directory initialized: {cls.upload_dir}")
         cls.setup_test_video()
+
+        # Index existing uploads once so per-request lookups are O(1)
+        for filename in os.listdir(cls.upload_dir):
+            if filename.startswith('video_'):
+                video_id = os.path.splitext(filename)[0][len('video_'):]
+                cls._video_index[video_id] = os.path.join(cls.upload_dir, filename)
+
+        # Warm the Whisper model in the background so the first
+        # transcribe request doesn't pay the ~140 MB load
+        threading.Thread(target=get_whisper_model, daemon=True).start()
     
     @classmethod
     def setup_test_video(cls):
@@ -264,6 +958,8 @@ class ClipsAIHandler(http.server.SimpleHTTPRequestHandler):
             self.serve_health()
         elif self.path == '/api/preloaded_video':
             self.serve_preloaded_video()
+        elif self.path.startswith('/api/jobs/'):
+            self.serve_job_status()
         elif self.path.startswith('/uploads/'):
             self.serve_uploaded_file()
         elif self.path.startswith('/downloads/'):
@@ -285,6 +981,36 @@ class ClipsAIHandler(http.server.SimpleHTTPRequestHandler):
         else:
             self.send_error(404, "API endpoint not found")
     
+    def _send_json(self, obj, status=200):
+        """Serialize and send a JSON response in a single socket write"""
+        try:
+            body = _json_dumps(obj)
+            self.send_response(status)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            # Transcripts compress 5-10x; level 1 because higher levels
+            # burn CPU for little extra on JSON. Tiny bodies fit one
+            # packet either way, so skip the header overhead for them.
+            if len(body) >= 1024 and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body, compresslevel=1)
+                self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Vary', 'Accept-Encoding')
+            self.send_header('Content-Length', str(len(body)))
+            # Piggy-back the body on the buffered headers so the status
+            # line, headers and payload leave in one write/packet. The
+            # header-terminating blank line has to go in before the
+            # body — end_headers() would append it after.
+            self._headers_buffer.append(b'\r\n')
+            self._headers_buffer.append(body)
+            self.flush_headers()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_error_json(self, e):
+        """Standard 500 body for API handler failures — kept deliberately
+        cheap since error paths shouldn't cost more than the request did"""
+        self._send_json({"success": False, "error": str(e)}, status=500)
+
     def serve_health(self):
         """Health check endpoint"""
         health = {
@@ -302,14 +1028,7 @@ class ClipsAIHandler(http.server.SimpleHTTPRequestHandler):
             }
         }
         
-        try:
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(health).encode())
-        except (BrokenPipeError, ConnectionResetError):
-            pass
+        self._send_json(health)
     
     def serve_main_page(self):
         """Serve the main web interface"""
@@ -655,11 +1374,13 @@ class ClipsAIHandler(http.server.SimpleHTTPRequestHandler):
 </html>'''
         
         try:
+            body = html_content.encode()
             self.send_response(200)
             self.send_header('Content-type', 'text/html')
             self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Content-Length', str(len(body)))
             self.end_headers()
-            self.wfile.write(html_content.encode())
+            self.wfile.write(body)
         except (BrokenPipeError, ConnectionResetError):
             pass
     
@@ -712,192 +1433,281 @@ class ClipsAIHandler(http.server.SimpleHTTPRequestHandler):
         """Handle video file uploads"""
         try:
             content_type = self.headers.get('Content-Type', '')
-            
+
             if not content_type.startswith('multipart/form-data'):
+                # Body is left unread; don't reuse this connection
+                self.close_connection = True
                 self.send_error(400, "Invalid content type")
                 return
             
-            # Parse multipart form data
-            form = cgi.FieldStorage(
-                fp=self.rfile,
-                headers=self.headers,
-                environ={'REQUEST_METHOD': 'POST'}
-            )
-            
-            if 'video' not in form:
+            content_length = int(self.headers.get('Content-Length', 0))
+            if content_length <= 0:
                 self.send_error(400, "No video file provided")
                 return
-            
-            video_file = form['video']
-            
-            if not video_file.filename:
+
+            # Generate unique filename; the extension comes from the part
+            # headers once the parser has read them
+            video_id = str(uuid.uuid4())
+
+            def dest_path_for(original_name):
+                file_extension = os.path.splitext(original_name)[1]
+                return os.path.join(self.upload_dir, f"video_{video_id}{file_extension}")
+
+            # Stream the upload straight to disk
+            original_name, file_path, file_size = _stream_upload_to_file(
+                self.rfile, content_type, content_length, dest_path_for)
+
+            if not original_name:
+                os.remove(file_path)
                 self.send_error(400, "No file selected")
                 return
-            
-            # Generate unique filename
-            video_id = str(uuid.uuid4())
-            file_extension = os.path.splitext(video_file.filename)[1]
-            filename = f"video_{video_id}{file_extension}"
-            file_path = os.path.join(self.upload_dir, filename)
-            
-            # Save uploaded file
-            with open(file_path, 'wb') as f:
-                shutil.copyfileobj(video_file.file, f)
-            
-            # Verify file was saved
-            if not os.path.exists(file_path):
-                raise RuntimeError("File was not saved properly")
-            
-            file_size = os.path.getsize(file_path)
-            
+
             if file_size == 0:
                 os.remove(file_path)
                 raise RuntimeError("Uploaded file is empty")
-            
+
+            filename = os.path.basename(file_path)
+
+            # Probe once now so later trims hit the duration cache
+            self.trimmer.get_video_duration(file_path)
+
+            # Record the path so later handlers skip the directory scan
+            with self._video_index_lock:
+                self._video_index[video_id] = file_path
+
             response = {
                 "success": True,
                 "video_id": video_id,
-                "filename": video_file.filename,
+                "filename": original_name,
                 "size": file_size,
                 "url": f"/uploads/{filename}"
             }
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(response)
             
         except Exception as e:
             print(f"❌ Upload error: {e}")
-            error_response = {
-                "success": False,
-                "error": str(e)
-            }
-            
-            try:
-                self.send_response(500)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(error_response).encode())
-            except (BrokenPipeError, ConnectionResetError):
-                pass
+            # The parser may have stopped mid-body; a desynced stream
+            # must never serve another keep-alive request
+            self.close_connection = True
+            self._send_error_json(e)
     
     def handle_transcribe(self):
         """Handle video transcription using Whisper AI"""
         try:
             content_length = int(self.headers.get('Content-Length', 0))
             post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            # _json_loads takes bytes directly — no intermediate str
+            data = _json_loads(post_data)
             
             video_id = data.get('video_id')
             if not video_id:
                 raise ValueError("No video_id provided")
             
             # Find video file
-            video_file = None
-            for filename in os.listdir(self.upload_dir):
-                if video_id in filename:
-                    video_file = os.path.join(self.upload_dir, filename)
-                    break
-            
-            if not video_file or not os.path.exists(video_file):
+            video_file = self._resolve_video(video_id)
+            if not video_file:
                 raise ValueError("Video file not found")
-            
-            # Load Whisper model
-            model = whisper.load_model("base")
-            
-            # Transcribe video
-            result = model.transcribe(video_file)
+
+            # Opt-in job mode: enqueue and return immediately; the
+            # client polls /api/jobs/<id> for the result
+            if data.get('async'):
+                job_id = str(uuid.uuid4())
+                future = _JOB_POOL.submit(self._transcribe_job, video_file)
+                with _JOBS_LOCK:
+                    # Drop completed jobs once the table gets large
+                    if len(_JOBS) > 64:
+                        for done_id in [j for j, f in _JOBS.items() if f.done()]:
+                            del _JOBS[done_id]
+                    _JOBS[job_id] = future
+
+                response = {
+                    "success": True,
+                    "job_id": job_id,
+                    "status": "queued"
+                }
+
+                self._send_json(response)
+                return
+
+            # Transcribe (cached — find_clips on the same upload is free)
+            result = transcribe_cached(video_file)
             
             response = {
                 "success": True,
                 "transcript": result["text"],
-                "segments": result["segments"]
+                # Only what the frontend reads — dropping ids and
+                # no_speech_prob cuts the payload for long videos
+                "segments": [{"start": s["start"], "end": s["end"], "text": s["text"]}
+                             for s in result["segments"]]
             }
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+
+            self._send_json(response)
             
         except Exception as e:
             print(f"❌ Transcription error: {e}")
-            error_response = {
-                "success": False,
-                "error": str(e)
-            }
-            
-            try:
-                self.send_response(500)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(error_response).encode())
-            except (BrokenPipeError, ConnectionResetError):
-                pass
+            self._send_error_json(e)
     
+    def _resolve_video(self, video_id):
+        """Resolve a video_id to its uploaded file path, or None"""
+        with self._video_index_lock:
+            path = self._video_index.get(video_id)
+        if path and os.path.exists(path):
+            return path
+
+        # Fallback: scan the upload directory (covers files uploaded by
+        # a previous process) and repopulate the index. scandir avoids
+        # the per-entry stat that listdir-based checks end up doing.
+        with os.scandir(self.upload_dir) as entries:
+            for entry in entries:
+                if video_id in entry.name and entry.is_file():
+                    with self._video_index_lock:
+                        self._video_index[video_id] = entry.path
+                    return entry.path
+
+        return None
+
+    @staticmethod
+    def _transcribe_job(video_file):
+        """Worker body for async transcription jobs"""
+        return transcribe_cached(video_file)
+
+    def serve_job_status(self):
+        """Report status (and result, when done) for an async job"""
+        try:
+            job_id = self.path.rsplit('/', 1)[-1]
+            with _JOBS_LOCK:
+                future = _JOBS.get(job_id)
+
+            if future is None:
+                response = {"success": False, "error": "Unknown job_id"}
+            elif not future.done():
+                response = {"success": True, "job_id": job_id, "status": "processing"}
+            else:
+                try:
+                    result = future.result()
+                    response = {
+                        "success": True,
+                        "job_id": job_id,
+                        "status": "done",
+                        "transcript": result["text"],
+                        "segments": [{"start": s["start"], "end": s["end"], "text": s["text"]}
+                                     for s in result["segments"]]
+                    }
+                except Exception as e:
+                    response = {
+                        "success": False,
+                        "job_id": job_id,
+                        "status": "failed",
+                        "error": str(e)
+                    }
+
+            self._send_json(response)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
     def handle_find_clips(self):
         """Find and automatically generate clips"""
         try:
             content_length = int(self.headers.get('Content-Length', 0))
             post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            # _json_loads takes bytes directly — no intermediate str
+            data = _json_loads(post_data)
             
             video_id = data.get('video_id')
             if not video_id:
                 raise ValueError("No video_id provided")
             
             # Find video file
-            video_file = None
-            for filename in os.listdir(self.upload_dir):
-                if video_id in filename:
-                    video_file = os.path.join(self.upload_dir, filename)
-                    break
-            
-            if not video_file or not os.path.exists(video_file):
+            video_file = self._resolve_video(video_id)
+            if not video_file:
                 raise ValueError("Video file not found")
             
-            # Load Whisper model for clip detection
-            model = whisper.load_model("base")
-            result = model.transcribe(video_file)
+            # Cached transcription — reuses the result from a preceding
+            # /api/transcribe call on the same video
+            result = transcribe_cached(video_file)
             
-            # Simple clip detection based on segments
+            # Simple clip detection based on segments. Long transcripts
+            # take the numpy path: one vectorized mask over three arrays
+            # instead of a Python-level test per segment, and only the
+            # five survivors get materialized as dicts.
+            segs = result["segments"]
             clips = []
-            for i, segment in enumerate(result["segments"]):
-                # Look for segments with high confidence and reasonable length
-                if segment["no_speech_prob"] < 0.5 and (segment["end"] - segment["start"]) > 2:
+            if len(segs) > 100:
+                count = len(segs)
+                probs = np.fromiter((s["no_speech_prob"] for s in segs),
+                                    dtype=np.float32, count=count)
+                starts = np.fromiter((s["start"] for s in segs),
+                                     dtype=np.float32, count=count)
+                ends = np.fromiter((s["end"] for s in segs),
+                                   dtype=np.float32, count=count)
+                mask = (probs < 0.5) & ((ends - starts) > 2)
+                for i in np.nonzero(mask)[0][:5]:
+                    segment = segs[i]
                     clips.append({
-                        "index": i,
+                        "index": int(i),
                         "start": segment["start"],
                         "end": segment["end"],
                         "text": segment["text"],
                         "confidence": 1.0 - segment["no_speech_prob"]
                     })
+            else:
+                for i, segment in enumerate(segs):
+                    # Look for segments with high confidence and reasonable length
+                    if segment["no_speech_prob"] < 0.5 and (segment["end"] - segment["start"]) > 2:
+                        clips.append({
+                            "index": i,
+                            "start": segment["start"],
+                            "end": segment["end"],
+                            "text": segment["text"],
+                            "confidence": 1.0 - segment["no_speech_prob"]
+                        })
             
             # Automatically generate clips
             generated_clips = []
             os.makedirs('./downloads', exist_ok=True)
             
+            # One ffmpeg pass stream-copies every clip from a single
+            # demux of the input; only the cuts that fail duration
+            # verification fall back to per-clip accurate re-encodes,
+            # which overlap on the shared pool
+            pending = []
             for clip in clips[:5]:  # Limit to first 5 clips
-                clip_id = str(uuid.uuid4())
+                clip_id = next_clip_id()
                 output_filename = f"clip_{clip['index']}_{clip_id}.mp4"
                 output_path = os.path.join('./downloads', output_filename)
-                
-                # Use precise trimmer
-                success = self.trimmer.trim_video_precise(
-                    video_file,
-                    output_path,
-                    clip['start'],
-                    clip['end']
-                )
-                
+                pending.append((clip, output_filename, output_path))
+
+            batch_ok = self.trimmer.trim_clips_batch(
+                video_file,
+                [(path, clip['start'], clip['end']) for clip, _, path in pending])
+
+            futures = []
+            for (clip, output_filename, output_path), ok in zip(pending, batch_ok):
+                if ok:
+                    future = concurrent.futures.Future()
+                    future.set_result(True)
+                else:
+                    future = _TRIM_POOL.submit(
+                        self.trimmer.trim_video_precise,
+                        video_file,
+                        output_path,
+                        clip['start'],
+                        clip['end']
+                    )
+                futures.append((clip, output_filename, output_path, future))
+
+            for clip, output_filename, output_path, future in futures:
+                try:
+                    success = future.result(timeout=300)
+                except Exception as e:
+                    print(f"❌ Clip generation failed: {e}")
+                    success = False
+
                 if success:
                     clip['generated_url'] = f"/downloads/{output_filename}"
                     clip['generated_path'] = output_path
-                
+
                 generated_clips.append(clip)
             
             response = {
@@ -905,34 +1715,19 @@ class ClipsAIHandler(http.server.SimpleHTTPRequestHandler):
                 "clips": generated_clips
             }
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(response)
             
         except Exception as e:
             print(f"❌ Find clips error: {e}")
-            error_response = {
-                "success": False,
-                "error": str(e)
-            }
-            
-            try:
-                self.send_response(500)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(error_response).encode())
-            except (BrokenPipeError, ConnectionResetError):
-                pass
+            self._send_error_json(e)
     
     def handle_trim_clip(self):
         """Handle manual clip trimming"""
         try:
             content_length = int(self.headers.get('Content-Length', 0))
             post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
+            # _json_loads takes bytes directly — no intermediate str
+            data = _json_loads(post_data)
             
             video_id = data.get('video_id')
             start_time = data.get('start_time')
@@ -942,17 +1737,12 @@ class ClipsAIHandler(http.server.SimpleHTTPRequestHandler):
                 raise ValueError("Missing required parameters")
             
             # Find video file
-            video_file = None
-            for filename in os.listdir(self.upload_dir):
-                if video_id in filename:
-                    video_file = os.path.join(self.upload_dir, filename)
-                    break
-            
-            if not video_file or not os.path.exists(video_file):
+            video_file = self._resolve_video(video_id)
+            if not video_file:
                 raise ValueError("Video file not found")
             
             # Generate output filename
-            clip_id = str(uuid.uuid4())
+            clip_id = next_clip_id()
             output_filename = f"clip_{clip_id}.mp4"
             output_path = os.path.join('./downloads', output_filename)
             
@@ -975,27 +1765,11 @@ class ClipsAIHandler(http.server.SimpleHTTPRequestHandler):
                 "end_time": end_time
             }
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(response)
             
         except Exception as e:
             print(f"❌ Trim clip error: {e}")
-            error_response = {
-                "success": False,
-                "error": str(e)
-            }
-            
-            try:
-                self.send_response(500)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(error_response).encode())
-            except (BrokenPipeError, ConnectionResetError):
-                pass
+            self._send_error_json(e)
     
     def serve_preloaded_video(self):
         """Serve information about the preloaded test video"""
@@ -1011,27 +1785,24 @@ class ClipsAIHandler(http.server.SimpleHTTPRequestHandler):
                     "error": "No preloaded video available"
                 }
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(response)
             
         except Exception as e:
             print(f"❌ Preloaded video error: {e}")
-            error_response = {
-                "success": False,
-                "error": str(e)
-            }
-            
-            try:
-                self.send_response(500)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(error_response).encode())
-            except (BrokenPipeError, ConnectionResetError):
-                pass
+            self._send_error_json(e)
+
+# Background transcription jobs: submit-and-poll so the HTTP connection
+# isn't held open for the minutes Whisper can take on long videos
+_JOB_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+_JOBS = {}
+_JOBS_LOCK = threading.Lock()
+
+class ThreadedTCPServer(socketserver.ThreadingTCPServer):
+    """Threaded server so a long transcription or download doesn't block
+    every other client (including the health poll)"""
+    allow_reuse_address = True
+    daemon_threads = True
+    request_queue_size = 128
 
 def main():
     """Main server function"""
@@ -1042,7 +1813,7 @@ def main():
     ClipsAIHandler.initialize_upload_dir()
     
     # Create server
-    with socketserver.TCPServer(("", PORT), ClipsAIHandler) as httpd:
+    with ThreadedTCPServer(("", PORT), ClipsAIHandler) as httpd:
         print(f"✅ Server started successfully!")
         print(f"🌐 Access at: http://localhost:{PORT}")
         print(f"🏥 Health check: http://localhost:{PORT}/api/health")